@@ -1,6 +1,8 @@
 import pathlib
 import re
+from collections import namedtuple
 
+import numpy as np
 import pytest
 from astropy.units import Quantity
 
@@ -8,6 +10,8 @@ from gammapy.irf import load_irf_dict_from_file
 
 PROD5_IRF_PATH = pathlib.Path(__file__).parent.parent / "irfs/"
 
+Prod5Stacked = namedtuple("Prod5Stacked", ["zen_pnt", "edisps", "aeffs", "migra_edges"])
+
 
 @pytest.fixture(scope="session")
 def prod5_irfs():
@@ -32,3 +36,19 @@ def prod5_irfs():
 
     # Sort dict by zenith angle
     return dict(sorted(irfs.items()))
+
+
+@pytest.fixture(scope="session")
+def prod5_stacked(prod5_irfs):
+    """Pointing zenith angles and stacked edisp/aeff data of the prod5 irfs"""
+    zen_pnt = np.fromiter(
+        (key.value for key in prod5_irfs), dtype=np.float64, count=len(prod5_irfs)
+    )
+    edisps = np.stack([irf["edisp"].data for irf in prod5_irfs.values()])
+    aeffs = np.stack([irf["aeff"].data for irf in prod5_irfs.values()])
+    first_irf = next(iter(prod5_irfs.values()))
+    migra_edges = first_irf["edisp"].axes["migra"].edges
+
+    return Prod5Stacked(
+        zen_pnt=zen_pnt, edisps=edisps, aeffs=aeffs, migra_edges=migra_edges
+    )
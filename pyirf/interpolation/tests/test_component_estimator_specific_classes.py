@@ -3,15 +3,25 @@ import numpy as np
 import pytest
 from scipy.stats import expon
 
+from pyirf.interpolation import (
+    GridDataInterpolator,
+    ParametrizedNearestNeighborSearcher,
+    ParametrizedNearestSimplexExtrapolator,
+    RadMaxEstimator,
+)
 from pyirf.utils import cone_solid_angle
 
+# source offset binning of the dummy psf tables
+PSF_BIN_EDGES = np.linspace(0, 1, 31) * u.deg
+PSF_OMEGAS = np.diff(cone_solid_angle(PSF_BIN_EDGES))
 
-def test_EnergyDispersionEstimator(prod5_irfs):
+
+def test_EnergyDispersionEstimator(prod5_stacked):
     from pyirf.interpolation import EnergyDispersionEstimator, QuantileInterpolator
 
-    zen_pnt = np.array([key.value for key in prod5_irfs.keys()])
-    edisps = np.array([irf["edisp"].data for irf in prod5_irfs.values()])
-    bin_edges = list(prod5_irfs.values())[0]["edisp"].axes["migra"].edges
+    zen_pnt = prod5_stacked.zen_pnt
+    edisps = prod5_stacked.edisps
+    bin_edges = prod5_stacked.migra_edges
     bin_width = np.diff(bin_edges)
 
     estimator = EnergyDispersionEstimator(
@@ -29,38 +39,29 @@ def test_EnergyDispersionEstimator(prod5_irfs):
 
     assert np.min(interp) >= 0
     assert np.all(np.isfinite(interp))
-    assert np.all(
-        np.logical_or(
-            np.isclose(np.sum(interp * bin_width[:, np.newaxis], axis=-2), 1),
-            np.isclose(np.sum(interp * bin_width[:, np.newaxis], axis=-2), 0),
-        )
-    )
+    norm = np.sum(interp * bin_width[:, np.newaxis], axis=-2)
+    assert np.all(np.isclose(norm, 1) | np.isclose(norm, 0))
     assert interp.shape == edisps[[1]].shape
 
 
 def test_PSFTableEstimator():
     from pyirf.interpolation import PSFTableEstimator, QuantileInterpolator
 
-    # dummy psf_table with 30 bins of true energ and 6 bins of fov-offset, rad-axis
-    # to be inflated later
-    dummy_psf_template = np.ones((30, 6, 1))
-
     zen_pnt = np.array([20, 40, 60])
-    bin_edges = np.linspace(0, 1, 31) * u.deg
-    omegas = np.diff(cone_solid_angle(bin_edges))
-
-    def hist(pnt):
-        """Create dummy psf for given pointing"""
-        histogram = np.diff(expon(scale=pnt / 400).cdf(bin_edges))
-        normed_hist = histogram / np.sum(histogram)
+    bin_edges = PSF_BIN_EDGES
+    omegas = PSF_OMEGAS
 
-        return normed_hist / omegas
+    # dummy psf_table with 30 bins of true energy and 6 bins of fov-offset,
+    # each pointing sharing the same normed exponential rad-axis histogram
+    cdf = expon.cdf(bin_edges.to_value(u.deg), scale=zen_pnt[:, np.newaxis] / 400)
+    hists = np.diff(cdf, axis=-1)
+    hists /= np.sum(hists, axis=-1, keepdims=True)
 
     dummy_psfs = (
-        np.array(
-            [np.apply_along_axis(hist, -1, dummy_psf_template * pnt) for pnt in zen_pnt]
+        np.broadcast_to(
+            hists[:, np.newaxis, np.newaxis, :], (len(zen_pnt), 30, 6, len(omegas))
         )
-        * u.sr**-1
+        / omegas
     )
 
     estimator = PSFTableEstimator(
@@ -83,12 +84,8 @@ def test_PSFTableEstimator():
     assert np.max(probability) <= 1
     assert np.min(probability) >= 0
     assert np.all(np.isfinite(interp))
-    assert np.all(
-        np.logical_or(
-            np.isclose(np.sum(probability, axis=-1), 1),
-            np.isclose(np.sum(probability, axis=-1), 0),
-        )
-    )
+    norm = np.sum(probability, axis=-1)
+    assert np.all(np.isclose(norm, 1) | np.isclose(norm, 0))
     assert interp.shape == dummy_psfs[[1]].shape
 
 
@@ -97,24 +94,18 @@ def test_EffectiveAreaEstimator_sythetic_data():
     from pyirf.interpolation import EffectiveAreaEstimator, GridDataInterpolator
 
     n_en = 20
-    n_th = 1
     en = np.logspace(-2, 2, n_en)
-    # applying a simple sigmoid function
-    aeff0 = 1.0e4 / (1 + 1 / en**2) * u.m**2
+    # applying a simple sigmoid function, single precision is plenty
+    # for the 3% accuracy tested below
+    aeff0 = (1.0e4 / (1 + 1 / en**2)).astype(np.float32) * u.m**2
 
     # assume that for parameters 'x' and 'y' the Aeff scales x*y*Aeff0
-    x = [0.9, 1.1]
-    y = [8.0, 11.5]
-    n_grid = len(x) * len(y)
-    aeff = np.empty((n_grid, n_th, n_en))
-    pars = np.empty((n_grid, 2))
-    i_grid = 0
-    for xx in x:
-        for yy in y:
-            aeff[i_grid, 0, :] = aeff0 * xx * yy / 10
-            pars[i_grid, :] = np.array([xx, yy])
-            i_grid += 1
-    aeff *= u.m**2
+    x = np.array([0.9, 1.1], dtype=np.float32)
+    y = np.array([8.0, 11.5], dtype=np.float32)
+    scale = np.multiply.outer(x, y).ravel() / 10
+    # shape (n_grid, n_th, n_en) with a single fov-offset bin
+    aeff = scale[:, np.newaxis, np.newaxis] * aeff0[np.newaxis, np.newaxis, :]
+    pars = np.stack(np.meshgrid(x, y, indexing="ij"), axis=-1).reshape(-1, 2)
     pars0 = np.array([1, 10])
     min_aeff = 1 * u.m**2
 
@@ -133,12 +124,12 @@ def test_EffectiveAreaEstimator_sythetic_data():
     assert np.allclose(aeff_interp[:, 0], aeff0, rtol=0.03, atol=min_aeff)
 
 
-def test_EffectiveAreaEstimator_prod5(prod5_irfs):
+def test_EffectiveAreaEstimator_prod5(prod5_stacked):
     """Test of interpolation of effective are on prod5 irfs"""
     from pyirf.interpolation import EffectiveAreaEstimator, GridDataInterpolator
 
-    zen_pnt = np.array([key.value for key in prod5_irfs.keys()])
-    aeffs = np.array([irf["aeff"].data for irf in prod5_irfs.values()])
+    zen_pnt = prod5_stacked.zen_pnt
+    aeffs = prod5_stacked.aeffs
     min_aeff = 1 * u.m**2
 
     estimator = EffectiveAreaEstimator(
@@ -156,15 +147,12 @@ def test_EffectiveAreaEstimator_prod5(prod5_irfs):
     assert interp.shape == aeffs[[1]].shape
     assert np.all(interp >= 0)
 
-    assert np.all(
-        np.logical_or(
-            np.logical_or(
-                np.logical_and(aeffs[[0]] <= interp, interp <= aeffs[[2]]),
-                np.logical_and(aeffs[[2]] <= interp, interp <= aeffs[[0]]),
-            ),
-            np.logical_or(interp == 0, interp == min_aeff.value),
-        )
-    )
+    # interpolated values have to lie between the neighboring grid values
+    a0, a2 = aeffs[0], aeffs[2]
+    in_range = (a0 <= interp) & (interp <= a2)
+    in_range |= (a2 <= interp) & (interp <= a0)
+    in_range |= (interp == 0) | (interp == min_aeff.value)
+    assert np.all(in_range)
 
 
 def test_RadMaxEstimator():
@@ -193,167 +181,167 @@ def test_RadMaxEstimator():
     assert np.allclose(interp, 1.5 * rad_max_1)
 
 
-def test_RadMaxEstimator_fill_val_handling_1D():
-    from pyirf.interpolation import (
-        GridDataInterpolator,
-        ParametrizedNearestNeighborSearcher,
-        ParametrizedNearestSimplexExtrapolator,
-        RadMaxEstimator,
-    )
-
-    grid_points_1D = np.array([[0], [1], [2]])
+@pytest.fixture(scope="module")
+def rad_max_1D():
+    grid_points = np.array([[0], [1], [2]])
 
     rad_max_1 = np.array([[0.95, 0.95, 0.5, 0.95, 0.95], [0.95, 0.5, 0.3, 0.5, 0.95]])
     rad_max_2 = np.array([[0.95, 0.5, 0.3, 0.5, 0.95], [0.5, 0.3, 0.2, 0.9, 0.5]])
     rad_max_3 = np.array([[0.95, 0.4, 0.2, 0.4, 0.5], [0.5, 0.3, 0, 0.94, 0.6]])
 
-    rad_max_1D = np.array([rad_max_1, rad_max_2, rad_max_3])
-
-    truth_0 = np.array([[0.95, 0.95, 0.7, 0.95, 0.95], [0.95, 0.7, 0.4, 0.1, 0.95]])
-    truth_1_5 = np.array([[0.95, 0.95, 0.4, 0.95, 0.95], [0.95, 0.4, 0.25, 0.7, 0.95]])
-
-    truth_4 = np.array([[0.95, 0.3, 0.1, 0.3, 0.95], [0.5, 0.3, 0, 0.95, 0.7]])
-
-    # State fill value
-    estim = RadMaxEstimator(
-        grid_points=grid_points_1D,
-        rad_max=rad_max_1D,
-        fill_value=0.95,
-        interpolator_cls=GridDataInterpolator,
-        interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestSimplexExtrapolator,
-        extrapolator_kwargs=None,
-    )
-
-    assert np.allclose(estim(np.array([-1])), truth_0)
-    assert np.allclose(estim(np.array([0.5])), truth_1_5)
-    assert np.allclose(estim(np.array([3])), truth_4)
+    truths = {
+        "truth_0": np.array(
+            [[0.95, 0.95, 0.7, 0.95, 0.95], [0.95, 0.7, 0.4, 0.1, 0.95]]
+        ),
+        "truth_1_5": np.array(
+            [[0.95, 0.95, 0.4, 0.95, 0.95], [0.95, 0.4, 0.25, 0.7, 0.95]]
+        ),
+        "truth_4": np.array([[0.95, 0.3, 0.1, 0.3, 0.95], [0.5, 0.3, 0, 0.95, 0.7]]),
+        "rad_max_1": rad_max_1,
+        "rad_max_3": rad_max_3,
+        "mean_1_2": (rad_max_1 + rad_max_2) / 2,
+    }
 
-    # Infer fill-val as max of rad-max vals
-    estim = RadMaxEstimator(
-        grid_points=grid_points_1D,
-        rad_max=rad_max_1D,
-        fill_value="infer",
-        interpolator_cls=GridDataInterpolator,
-        interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestSimplexExtrapolator,
-        extrapolator_kwargs=None,
-    )
+    return grid_points, np.array([rad_max_1, rad_max_2, rad_max_3]), truths
 
-    assert np.allclose(estim(np.array([0.5])), truth_1_5)
-    assert np.allclose(estim(np.array([3])), truth_4)
 
-    # Nearest neighbor cases
-    estim = RadMaxEstimator(
-        grid_points=grid_points_1D,
-        rad_max=rad_max_1D,
-        fill_value="infer",
-        interpolator_cls=ParametrizedNearestNeighborSearcher,
-        interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestNeighborSearcher,
-        extrapolator_kwargs=None,
-    )
-
-    assert np.allclose(estim(np.array([0.25])), rad_max_1)
-    assert np.allclose(estim(np.array([3])), rad_max_3)
-
-    # Ignore fill values
-    estim = RadMaxEstimator(
-        grid_points=grid_points_1D,
-        rad_max=rad_max_1D,
-        fill_value=None,
-        interpolator_cls=GridDataInterpolator,
-        interpolator_kwargs=None,
-        extrapolator_cls=None,
-        extrapolator_kwargs=None,
-    )
-
-    assert np.allclose(estim(np.array([0.5])), (rad_max_1 + rad_max_2) / 2)
-
-
-def test_RadMaxEstimator_fill_val_handling_2D():
-    from pyirf.interpolation import (
-        GridDataInterpolator,
-        ParametrizedNearestNeighborSearcher,
-        ParametrizedNearestSimplexExtrapolator,
-        RadMaxEstimator,
-    )
-
-    grid_points_2D = np.array([[0, 0], [1, 0], [0, 1]])
+@pytest.fixture(scope="module")
+def rad_max_2D():
+    grid_points = np.array([[0, 0], [1, 0], [0, 1]])
 
     rad_max_1 = np.array([[0.95, 0.95, 0.5, 0.95, 0.95], [0.5, 0.5, 0.3, 0.5, 0.5]])
     rad_max_2 = np.array([[0.95, 0.95, 0.5, 0.5, 0.95], [0.95, 0.95, 0.95, 0.5, 0.95]])
     rad_max_3 = np.array([[0.95, 0.5, 0.5, 0.4, 0.5], [0.4, 0.95, 0, 0.5, 0.95]])
 
-    rad_max_2D = np.array([rad_max_1, rad_max_2, rad_max_3])
-
-    # Only test for combinatoric cases, thus inter- and extrapolation have the same
-    # result in this special test case. Correct estimation is checked elsewhere
-    truth = np.array([[0.95, 0.95, 0.5, 0.4, 0.95], [0.4, 0.95, 0, 0.5, 0.95]])
-
-    # State fill-value
-    estim = RadMaxEstimator(
-        grid_points=grid_points_2D,
-        rad_max=rad_max_2D,
-        fill_value=0.95,
-        interpolator_cls=GridDataInterpolator,
-        interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestSimplexExtrapolator,
-        extrapolator_kwargs=None,
-    )
-
-    assert np.allclose(estim(np.array([0.5, 0.5])), truth)
-    assert np.allclose(estim(np.array([-1, -1])), truth)
+    rad_max = np.array([rad_max_1, rad_max_2, rad_max_3])
+
+    truths = {
+        # Only test for combinatoric cases, thus inter- and extrapolation have the
+        # same result in this special test case. Correct estimation is checked elsewhere
+        "truth": np.array([[0.95, 0.95, 0.5, 0.4, 0.95], [0.4, 0.95, 0, 0.5, 0.95]]),
+        "rad_max_1": rad_max_1,
+        "rad_max_3": rad_max_3,
+        "griddata_0.25": GridDataInterpolator(grid_points, rad_max)(
+            np.array([[0.25, 0.25]])
+        ),
+    }
+
+    return grid_points, rad_max, truths
+
+
+@pytest.mark.parametrize(
+    "fill_value, interp_cls, extrap_cls, targets, expected",
+    [
+        # State fill value
+        (
+            0.95,
+            GridDataInterpolator,
+            ParametrizedNearestSimplexExtrapolator,
+            [np.array([-1]), np.array([0.5]), np.array([3])],
+            ["truth_0", "truth_1_5", "truth_4"],
+        ),
+        # Infer fill-val as max of rad-max vals
+        (
+            "infer",
+            GridDataInterpolator,
+            ParametrizedNearestSimplexExtrapolator,
+            [np.array([0.5]), np.array([3])],
+            ["truth_1_5", "truth_4"],
+        ),
+        # Nearest neighbor cases
+        (
+            "infer",
+            ParametrizedNearestNeighborSearcher,
+            ParametrizedNearestNeighborSearcher,
+            [np.array([0.25]), np.array([3])],
+            ["rad_max_1", "rad_max_3"],
+        ),
+        # Ignore fill values
+        (None, GridDataInterpolator, None, [np.array([0.5])], ["mean_1_2"]),
+    ],
+)
+def test_RadMaxEstimator_fill_val_handling_1D(
+    rad_max_1D, fill_value, interp_cls, extrap_cls, targets, expected
+):
+    grid_points, rad_max, truths = rad_max_1D
 
-    # Infer fill-val as max of rad-max vals
     estim = RadMaxEstimator(
-        grid_points=grid_points_2D,
-        rad_max=rad_max_2D,
-        fill_value="infer",
-        interpolator_cls=GridDataInterpolator,
+        grid_points=grid_points,
+        rad_max=rad_max,
+        fill_value=fill_value,
+        interpolator_cls=interp_cls,
         interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestSimplexExtrapolator,
+        extrapolator_cls=extrap_cls,
         extrapolator_kwargs=None,
     )
 
-    assert np.allclose(estim(np.array([0.5, 0.5])), truth)
-    assert np.allclose(estim(np.array([-1, -1])), truth)
-
-    # Nearest neighbor cases
-    estim = RadMaxEstimator(
-        grid_points=grid_points_2D,
-        rad_max=rad_max_2D,
-        fill_value="infer",
-        interpolator_cls=ParametrizedNearestNeighborSearcher,
-        interpolator_kwargs=None,
-        extrapolator_cls=ParametrizedNearestNeighborSearcher,
-        extrapolator_kwargs=None,
+    # Estimators only support one target point per call, compare all at once
+    estimates = np.stack(
+        [estim(target).reshape(rad_max.shape[1:]) for target in targets]
     )
+    assert np.allclose(estimates, np.stack([truths[key] for key in expected]))
+
+
+@pytest.mark.parametrize(
+    "fill_value, interp_cls, extrap_cls, targets, expected",
+    [
+        # State fill-value
+        (
+            0.95,
+            GridDataInterpolator,
+            ParametrizedNearestSimplexExtrapolator,
+            [np.array([0.5, 0.5]), np.array([-1, -1])],
+            ["truth", "truth"],
+        ),
+        # Infer fill-val as max of rad-max vals
+        (
+            "infer",
+            GridDataInterpolator,
+            ParametrizedNearestSimplexExtrapolator,
+            [np.array([0.5, 0.5]), np.array([-1, -1])],
+            ["truth", "truth"],
+        ),
+        # Nearest neighbor cases
+        (
+            "infer",
+            ParametrizedNearestNeighborSearcher,
+            ParametrizedNearestNeighborSearcher,
+            [np.array([0.25, 0.25]), np.array([0, 1.1])],
+            ["rad_max_1", "rad_max_3"],
+        ),
+        # Ignore fill-values
+        (
+            None,
+            GridDataInterpolator,
+            None,
+            [np.array([0.25, 0.25])],
+            ["griddata_0.25"],
+        ),
+    ],
+)
+def test_RadMaxEstimator_fill_val_handling_2D(
+    rad_max_2D, fill_value, interp_cls, extrap_cls, targets, expected
+):
+    grid_points, rad_max, truths = rad_max_2D
 
-    assert np.allclose(estim(np.array([0.25, 0.25])), rad_max_1)
-    assert np.allclose(estim(np.array([0, 1.1])), rad_max_3)
-
-    # Ignore fill-values
     estim = RadMaxEstimator(
-        grid_points=grid_points_2D,
-        rad_max=rad_max_2D,
-        fill_value=None,
-        interpolator_cls=GridDataInterpolator,
+        grid_points=grid_points,
+        rad_max=rad_max,
+        fill_value=fill_value,
+        interpolator_cls=interp_cls,
         interpolator_kwargs=None,
-        extrapolator_cls=None,
+        extrapolator_cls=extrap_cls,
         extrapolator_kwargs=None,
     )
 
-    truth_interpolator = GridDataInterpolator(grid_points_2D, rad_max_2D)
-
-    assert np.allclose(
-        estim(np.array([0.25, 0.25])), truth_interpolator(np.array([0.25, 0.25]))
+    # Estimators only support one target point per call, compare all at once
+    estimates = np.stack(
+        [estim(target).reshape(rad_max.shape[1:]) for target in targets]
     )
+    assert np.allclose(estimates, np.stack([truths[key] for key in expected]))
 
 
 def test_RadMaxEstimator_fill_val_handling_3D():
-    from pyirf.interpolation import GridDataInterpolator, RadMaxEstimator
-
     grid_points_3D = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
 
     rad_max = np.array([[0.95], [0.95], [0.95], [0.95]])